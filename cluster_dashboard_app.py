@@ -18,6 +18,14 @@ from pathlib import Path
 import pandas as pd
 import streamlit as st
 import altair as alt
+
+# Optional: ship Altair chart data as columnar buffers instead of inline JSON
+# (needs vegafusion[embed]); the default JSON transformer is used otherwise
+try:
+    alt.data_transformers.enable("vegafusion")
+except Exception:  # pragma: no cover
+    pass
+
 # Optional DB clients: don't crash if not installed in prod
 try:
     import psycopg2  # psycopg 2.x
@@ -49,6 +57,10 @@ except Exception:  # pragma: no cover
         return ""
 
 
+# Cap on bar-chart marks per level; Vega render time and payload grow with
+# mark count, while the (virtualized) table below still lists every cluster
+CHART_TOP_N = 40
+
 BASE_DIR = Path(__file__).resolve().parent
 _level_env = os.getenv("CLUSTER_LEVEL_CSV", "").strip()
 _cluster_env = os.getenv("CLUSTER_CLUSTER_CSV", "").strip()
@@ -57,7 +69,24 @@ CLUSTER_CSV = Path(_cluster_env) if _cluster_env else (BASE_DIR / "cluster_clust
 
 
 @st.cache_data(show_spinner=False)
-def load_csv(path: Path) -> pd.DataFrame:
+def load_csv(path_str: str, mtime_ns: int) -> pd.DataFrame:
+    """Load a summary table, cached on (path, mtime).
+
+    The cache key is the plain string path plus st_mtime_ns, so reruns hit
+    the cache without hashing Path objects, while a rewritten export file
+    invalidates the entry immediately.
+    """
+    path = Path(path_str)
+    # Prefer the typed Parquet sidecar when the exporter produced one:
+    # smaller, faster to load, and dtypes survive without re-inference.
+    # Only trust it when it's at least as fresh as the CSV, in case a
+    # later export rewrote the CSV but the sidecar write failed.
+    pq_path = path.with_suffix(".parquet")
+    try:
+        if pq_path.exists() and pq_path.stat().st_mtime_ns >= mtime_ns:
+            return pd.read_parquet(pq_path)
+    except Exception:
+        pass
     df = pd.read_csv(path)
     return df
 
@@ -69,6 +98,73 @@ def format_float(x, ndigits=2):
         return "N/A"
 
 
+# Wrap long axis labels client-side in Vega: break at the last space before
+# ~26 chars and render two lines. Saves a Python pass over every cluster name
+# and an extra wrapped column serialized into each chart.
+LABEL_WRAP_EXPR = (
+    "length(datum.label) > 26 && indexof(slice(datum.label, 0, 27), ' ') > 0"
+    " ? [slice(datum.label, 0, lastindexof(slice(datum.label, 0, 27), ' ')),"
+    " slice(datum.label, lastindexof(slice(datum.label, 0, 27), ' ') + 1)]"
+    " : datum.label"
+)
+
+
+def build_bar_spec(x_field: str, x_title: str, x_format: str, color: str, tooltip: list, show_labels: bool = True) -> dict:
+    """Literal Vega-Lite spec for the per-level horizontal bar charts.
+
+    Handing st.vega_lite_chart a plain dict skips Altair's schemapi object
+    construction and validation, which dominates chart build time on every
+    rerun; the data itself is passed separately as a DataFrame.
+    """
+    y_axis = {"labelAngle": 0, "title": None}
+    if show_labels:
+        y_axis.update({"labelLimit": 800, "labelPadding": 4, "labelExpr": LABEL_WRAP_EXPR})
+    else:
+        y_axis.update({"labels": False, "ticks": False})
+    return {
+        "mark": {"type": "bar", "color": color, "opacity": 0.85},
+        "encoding": {
+            "y": {
+                "field": "cluster_name",
+                "type": "nominal",
+                "sort": {"field": "post_count", "order": "descending"},
+                "axis": y_axis,
+            },
+            "x": {
+                "field": x_field,
+                "type": "quantitative",
+                "title": x_title,
+                "axis": {"format": x_format},
+            },
+            "tooltip": tooltip,
+        },
+        "height": {"step": 24},
+    }
+
+
+@st.cache_data(show_spinner=False)
+def prepare_cluster_frames(cluster_df: pd.DataFrame) -> dict:
+    """Split the cluster summary into per-level frames, coerced once.
+
+    Streamlit reruns the whole script on every widget interaction, so doing
+    the numeric coercions and name fallbacks in one cached pass (instead
+    of per level, per rerun) keeps interactions snappy.
+    """
+    df = cluster_df.copy()
+    # Fallback names only where missing, via vectorized string concat
+    # (no per-row Python lambda)
+    mask = df["cluster_name"].isna()
+    if mask.any():
+        df.loc[mask, "cluster_name"] = "Cluster " + df.loc[mask, "cluster_id"].astype(str)
+    df["avg_base_score"] = pd.to_numeric(df["avg_base_score"], errors="coerce").round(0).astype("Int64")
+    df["stddev_base_score"] = pd.to_numeric(df["stddev_base_score"], errors="coerce").round(0).astype("Int64")
+    df["avg_score"] = pd.to_numeric(df["avg_score"], errors="coerce").round(2)
+    df["stddev_score"] = pd.to_numeric(df["stddev_score"], errors="coerce").round(2)
+    df["post_count"] = pd.to_numeric(df["post_count"], errors="coerce").fillna(0).astype(int)
+    return dict(list(df.groupby("level", sort=False)))
+
+
+@st.cache_data(ttl=3600)
 def get_database_url() -> str:
     """Resolve DATABASE_URL in a Streamlit-friendly way.
 
@@ -115,28 +211,44 @@ def get_database_url() -> str:
     return ""
 
 
-def connect_db():
+@st.cache_resource(show_spinner=False)
+def get_conn():
+    """Open (and cache) a single DB connection for the session.
+
+    st.cache_resource keeps the connection alive across reruns, so widget
+    interactions reuse it instead of paying a fresh Postgres handshake.
+    Call get_conn.clear() to force a reconnect after an interface error.
+    """
     url = get_database_url()
     if not url:
         return None
     try:
+        # Read-only dashboard: autocommit keeps the long-lived session out
+        # of "idle in transaction" between reruns (which would pin xmin and
+        # trip idle_in_transaction_session_timeout)
         if HAVE_PSYCOPG2:
-            return psycopg2.connect(url, cursor_factory=RealDictCursor)
+            conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+            conn.autocommit = True
+            return conn
         if HAVE_PSYCOPG:
-            return psycopg.connect(url, row_factory=dict_row)
+            return psycopg.connect(url, row_factory=dict_row, autocommit=True)
         return None
     except Exception:
         return None
 
 
-def fetch_cluster_posts(level: int, cluster_id: int, sort_by: str = "score") -> pd.DataFrame:
-    """Fetch posts for a given cluster level/id from the DB, sorted by score or date.
+@st.cache_data(ttl=600, show_spinner=False, max_entries=128)
+def _fetch_cluster_posts_cached(level: int, cluster_id: int, sort_by: str) -> pd.DataFrame:
+    """Cached query body for fetch_cluster_posts.
 
-    Returns an empty DataFrame if DB is not reachable.
+    Cached on (level, cluster_id, sort_by) so repeat selections skip the
+    Postgres round-trip; the connection comes from get_conn() internally
+    to keep all arguments hashable. Raises on DB failure — st.cache_data
+    doesn't store exceptions, so an outage is never cached as a result.
     """
-    conn = connect_db()
+    conn = get_conn()
     if conn is None:
-        return pd.DataFrame()
+        raise ConnectionError("database unavailable")
     id_col = f"ea_cluster_{int(level)}"
     order = "score DESC NULLS LAST" if sort_by == "score" else "posted_at DESC NULLS LAST"
     sql = f"""
@@ -152,29 +264,40 @@ def fetch_cluster_posts(level: int, cluster_id: int, sort_by: str = "score") ->
         ORDER BY {order}
         LIMIT 500
     """
+    with conn.cursor() as cur:
+        cur.execute(sql, (int(cluster_id),))
+        rows = cur.fetchall()
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        # Format types and rounding
+        if "posted_at" in df.columns:
+            try:
+                df["posted_at"] = pd.to_datetime(df["posted_at"]).dt.date
+            except Exception:
+                pass
+        for c in ["base_score"]:
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce").round(0).astype("Int64")
+        for c in ["score"]:
+            if c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce").round(2)
+    return df
+
+
+def fetch_cluster_posts(level: int, cluster_id: int, sort_by: str = "score") -> pd.DataFrame:
+    """Fetch posts for a given cluster level/id from the DB, sorted by score or date.
+
+    Uncached wrapper: on any failure it clears the connection and URL
+    caches so the next rerun retries (covers a DB that was briefly down
+    or a URL that was only configured after startup) and returns an
+    empty DataFrame.
+    """
     try:
-        with conn.cursor() as cur:
-            cur.execute(sql, (int(cluster_id),))
-            rows = cur.fetchall()
-        conn.close()
-        df = pd.DataFrame(rows)
-        if not df.empty:
-            # Format types and rounding
-            if "posted_at" in df.columns:
-                try:
-                    df["posted_at"] = pd.to_datetime(df["posted_at"]).dt.date
-                except Exception:
-                    pass
-            for c in ["base_score"]:
-                if c in df.columns:
-                    df[c] = pd.to_numeric(df[c], errors="coerce").round(0).astype("Int64")
-            for c in ["score"]:
-                if c in df.columns:
-                    df[c] = pd.to_numeric(df[c], errors="coerce").round(2)
-        return df
+        return _fetch_cluster_posts_cached(int(level), int(cluster_id), sort_by)
     except Exception:
         try:
-            conn.close()
+            get_conn.clear()
+            get_database_url.clear()
         except Exception:
             pass
         return pd.DataFrame()
@@ -193,8 +316,8 @@ def main():
         )
         st.stop()
 
-    level_df = load_csv(LEVEL_CSV)
-    cluster_df = load_csv(CLUSTER_CSV)
+    level_df = load_csv(str(LEVEL_CSV), LEVEL_CSV.stat().st_mtime_ns)
+    cluster_df = load_csv(str(CLUSTER_CSV), CLUSTER_CSV.stat().st_mtime_ns)
 
     # No sidebar / controls — show all levels and clusters by default
     available_levels = sorted(cluster_df["level"].dropna().unique().tolist())
@@ -238,86 +361,54 @@ def main():
         c1.metric("Avg Base (±Std)", format_float(r.get("avg_base_score")), f"±{format_float(r.get('stddev_base_score'))}")
         c2.metric("Avg Score (±Std)", format_float(r.get("avg_score")), f"±{format_float(r.get('stddev_score'))}")
 
-    # Helper for readable wrapped labels
-    def wrap_label(text: str, width: int = 22) -> str:
-        if not isinstance(text, str):
-            return str(text)
-        words = text.split()
-        lines = []
-        cur = []
-        cur_len = 0
-        for w in words:
-            if cur_len + len(w) + (1 if cur else 0) > width:
-                lines.append(" ".join(cur))
-                cur = [w]
-                cur_len = len(w)
-            else:
-                cur.append(w)
-                cur_len += len(w) + (1 if cur_len else 0)
-        if cur:
-            lines.append(" ".join(cur))
-        return "\n".join(lines)
+    # Per-level frames, coerced and split once (cached across reruns)
+    level_frames = prepare_cluster_frames(cluster_df)
 
     # Show all levels; two-card layout per level (Bar chart + Heatmapped table)
     for i, level in enumerate(available_levels):
         if i > 0:
             st.divider()
         st.subheader(f"{int(level)} Clusters")
-        df = cluster_df[cluster_df["level"] == level].copy()
-
-        # Ensure names and add wrapped label for chart readability
-        df["cluster_name"] = df["cluster_name"].fillna(df["cluster_id"].apply(lambda x: f"Cluster {x}"))
-        df["cluster_name_wrapped"] = df["cluster_name"].apply(lambda s: wrap_label(s, width=26))
+        df = level_frames[level]
 
         # Charts row: two bar charts side by side (Posts left, Avg Base right)
         col_left, col_right = st.columns([1, 1])
-        chart_df = df.sort_values(by="post_count", ascending=False).copy()
+        chart_df = df.sort_values(by="post_count", ascending=False)
+
+        top_df = chart_df.nlargest(CHART_TOP_N, "post_count") if len(chart_df) > CHART_TOP_N else chart_df
+        chart_data = top_df[["cluster_name", "post_count", "avg_base_score", "stddev_base_score"]]
 
         with col_left:
             st.markdown("**Posts by Cluster**")
-            left_chart = (
-                alt.Chart(chart_df)
-                .mark_bar(color="#ff7f0e", opacity=0.85)
-                .encode(
-                    y=alt.Y(
-                        "cluster_name_wrapped:N",
-                        sort=alt.SortField(field="post_count", order="descending"),
-                        axis=alt.Axis(labelAngle=0, labelLimit=800, labelPadding=4, title=None),
-                    ),
-                    x=alt.X("post_count:Q", title="Posts", axis=alt.Axis(format=",d")),
-                    tooltip=[
-                        alt.Tooltip("cluster_name:N", title="Cluster"),
-                        alt.Tooltip("post_count:Q", title="Posts", format=",d"),
-                    ],
-                )
-                .properties(height={"step": 24})
+            left_spec = build_bar_spec(
+                "post_count", "Posts", ",d", "#ff7f0e",
+                tooltip=[
+                    {"field": "cluster_name", "type": "nominal", "title": "Cluster"},
+                    {"field": "post_count", "type": "quantitative", "title": "Posts", "format": ",d"},
+                ],
             )
-            st.altair_chart(left_chart, use_container_width=True)
+            st.vega_lite_chart(chart_data, left_spec, use_container_width=True)
 
         with col_right:
             st.markdown("**Avg Base Score by Cluster**")
-            right_chart = (
-                alt.Chart(chart_df)
-                .mark_bar(color="#1f77b4", opacity=0.85)
-                .encode(
-                    y=alt.Y(
-                        "cluster_name_wrapped:N",
-                        sort=alt.SortField(field="post_count", order="descending"),
-                        axis=alt.Axis(labelAngle=0, labels=False, ticks=False, title=None),
-                    ),
-                    x=alt.X("avg_base_score:Q", title="Avg Base Score", axis=alt.Axis(format=".0f")),
-                    tooltip=[
-                        alt.Tooltip("cluster_name:N", title="Cluster"),
-                        alt.Tooltip("avg_base_score:Q", title="Avg Base", format=".0f"),
-                        alt.Tooltip("stddev_base_score:Q", title="Std Base", format=".0f"),
-                    ],
-                )
-                .properties(height={"step": 24})
+            right_spec = build_bar_spec(
+                "avg_base_score", "Avg Base Score", ".0f", "#1f77b4",
+                tooltip=[
+                    {"field": "cluster_name", "type": "nominal", "title": "Cluster"},
+                    {"field": "avg_base_score", "type": "quantitative", "title": "Avg Base", "format": ".0f"},
+                    {"field": "stddev_base_score", "type": "quantitative", "title": "Std Base", "format": ".0f"},
+                ],
+                show_labels=False,
+            )
+            st.vega_lite_chart(chart_data, right_spec, use_container_width=True)
+
+        if len(top_df) < len(chart_df):
+            st.caption(
+                f"Charts show the top {CHART_TOP_N} clusters by posts; "
+                f"the table below lists all {len(chart_df)}."
             )
-            st.altair_chart(right_chart, use_container_width=True)
 
         # Second row: full-width table with rounding and native progress coloring
-        st.markdown("**Table**")
         with st.container():
             st.markdown("**Table**")
             display_cols = [
@@ -328,13 +419,9 @@ def main():
                 "avg_score",
                 "stddev_score",
             ]
-            display_df = df[display_cols].copy()
-            # Coerce and round values sensibly
-            display_df["avg_base_score"] = pd.to_numeric(display_df["avg_base_score"], errors="coerce").round(0).astype("Int64")
-            display_df["stddev_base_score"] = pd.to_numeric(display_df["stddev_base_score"], errors="coerce").round(0).astype("Int64")
-            display_df["avg_score"] = pd.to_numeric(display_df["avg_score"], errors="coerce").round(2)
-            display_df["stddev_score"] = pd.to_numeric(display_df["stddev_score"], errors="coerce").round(2)
-            display_df["post_count"] = pd.to_numeric(display_df["post_count"], errors="coerce").fillna(0).astype(int)
+            # Values are already coerced and rounded in prepare_cluster_frames;
+            # downstream only reads, so no defensive copy is needed
+            display_df = df[display_cols]
 
             # Streamlit-native table with progress bars per column (no matplotlib/pandas Styler)
             max_posts = int(display_df["post_count"].max() or 1)
@@ -345,6 +432,7 @@ def main():
 
             st.dataframe(
                 display_df,
+                key=f"tbl_{int(level)}",
                 use_container_width=True,
                 height=min(900, 80 + 24 * len(display_df)),
                 column_config={
@@ -371,12 +459,11 @@ def main():
         with st.container():
             st.markdown("")
             st.markdown("**View Posts in Cluster**")
-            # Build selector (sorted by posts desc)
-            if not df.empty and "post_count" in df.columns:
-                picker_df = df.sort_values(by="post_count", ascending=False)[["cluster_id", "cluster_name"]].copy()
+            # Build selector from the already-sorted chart frame (posts desc)
+            if not chart_df.empty:
                 select_options = [
                     f"{int(c_id)} — {name}"
-                    for c_id, name in zip(picker_df["cluster_id"], picker_df["cluster_name"])
+                    for c_id, name in chart_df[["cluster_id", "cluster_name"]].itertuples(index=False, name=None)
                 ]
             else:
                 select_options = []
@@ -402,6 +489,7 @@ def main():
                 else:
                     st.dataframe(
                         posts_df[[c for c in ["posted_at", "title", "author_display_name", "base_score", "score"] if c in posts_df.columns]],
+                        key=f"posts_{int(level)}",
                         use_container_width=True,
                         hide_index=True,
                     )
@@ -0,0 +1,66 @@
+-- Indexes and a materialized summary view for fellowship_mvp.
+--
+-- Apply with: psql "$DATABASE_URL" -f migrations/001_cluster_indexes_and_summary_view.sql
+--
+-- Note: CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so
+-- run this file without wrapping it in BEGIN/COMMIT (psql runs each statement
+-- in its own transaction by default).
+
+-- Covering indexes per cluster level: fetch_cluster_posts and the summary
+-- aggregates filter on ea_cluster_N, so these turn seq scans into
+-- index(-only) scans.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fm_ea_cluster_5
+    ON fellowship_mvp (ea_cluster_5) INCLUDE (base_score, score, posted_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fm_ea_cluster_12
+    ON fellowship_mvp (ea_cluster_12) INCLUDE (base_score, score, posted_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fm_ea_cluster_30
+    ON fellowship_mvp (ea_cluster_30) INCLUDE (base_score, score, posted_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fm_ea_cluster_60
+    ON fellowship_mvp (ea_cluster_60) INCLUDE (base_score, score, posted_at);
+
+-- Precomputed per-level and per-cluster aggregates. Rows with
+-- is_level_row = 1 are the per-level subtotals; their cluster_id is the
+-- sentinel -1 (instead of NULL) so the unique index below can support
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY.
+--
+-- summarize_cluster_scores.py refreshes and exports from this view when it
+-- exists, and falls back to the equivalent ad-hoc query otherwise.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_cluster_summary AS
+SELECT
+    GROUPING(cluster_id)::int AS is_level_row,
+    level,
+    COALESCE(cluster_id, -1) AS cluster_id,
+    cluster_name,
+    COUNT(*)::int AS post_count,
+    SUM(CASE WHEN ea_classification = 'EA_META' THEN 1 ELSE 0 END)::int AS meta_posts,
+    SUM(CASE WHEN ea_classification = 'EA_PROPER' THEN 1 ELSE 0 END)::int AS proper_posts,
+    ROUND(AVG(base_score)::numeric, 4) AS avg_base_score,
+    ROUND(STDDEV(base_score)::numeric, 4) AS stddev_base_score,
+    ROUND(AVG(score)::numeric, 4) AS avg_score,
+    ROUND(STDDEV(score)::numeric, 4) AS stddev_score
+FROM (
+    SELECT 5 AS level, ea_cluster_5 AS cluster_id,
+           COALESCE(ea_cluster_5_name, 'Cluster ' || ea_cluster_5::text) AS cluster_name,
+           ea_classification, base_score, score
+    FROM fellowship_mvp WHERE ea_cluster_5 IS NOT NULL
+    UNION ALL
+    SELECT 12, ea_cluster_12,
+           COALESCE(ea_cluster_12_name, 'Cluster ' || ea_cluster_12::text),
+           ea_classification, base_score, score
+    FROM fellowship_mvp WHERE ea_cluster_12 IS NOT NULL
+    UNION ALL
+    SELECT 30, ea_cluster_30,
+           COALESCE(ea_cluster_30_name, 'Cluster ' || ea_cluster_30::text),
+           ea_classification, base_score, score
+    FROM fellowship_mvp WHERE ea_cluster_30 IS NOT NULL
+    UNION ALL
+    SELECT 60, ea_cluster_60,
+           COALESCE(ea_cluster_60_name, 'Cluster ' || ea_cluster_60::text),
+           ea_classification, base_score, score
+    FROM fellowship_mvp WHERE ea_cluster_60 IS NOT NULL
+) AS t
+GROUP BY GROUPING SETS ((level), (level, cluster_id, cluster_name));
+
+-- Required for REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_cluster_summary
+    ON mv_cluster_summary (level, cluster_id);